@@ -20,7 +20,8 @@ import sys
 import json
 import time
 import datetime
-from elasticsearch import Elasticsearch
+import asyncio
+from elasticsearch import AsyncElasticsearch
 import argparse
 
 def parse_args():
@@ -36,41 +37,56 @@ def get_today_index():
     today = datetime.datetime.now().strftime("%Y.%m.%d")
     return f"filebeat-7.*-{today}"
 
-def check_data_exists(es, index_pattern=None, verbose=False):
-    if index_pattern is None:
-        index_pattern = get_today_index()
-    
+async def check_data_exists(es, index_pattern, verbose=False):
+    # The pattern is resolved once in run(); recomputing it here every poll
+    # would re-run strftime and could flip the date mid-loop at midnight
     print(f"Checking for data in index pattern: {index_pattern}")
-    
+
     try:
-        # Check if indices exist using the stats API which is more reliable for wildcards
-        indices_stats = es.indices.stats(index=index_pattern, ignore_unavailable=True)
-        if not indices_stats['indices']:
+        # Resolve the wildcard cheaply first; while waiting for data the
+        # common case is that nothing matches yet, and this avoids fanning
+        # the heavier queries out across the cluster on every poll
+        resolved = await es.indices.resolve_index(name=index_pattern, expand_wildcards='open')
+        concrete_indices = [entry['name'] for entry in resolved.get('indices', [])]
+        if not concrete_indices:
             print(f"No indices matching pattern {index_pattern} found.")
             return False
-        
-        # Get total document count across all matching indices
-        total_docs = 0
-        for idx, stats in indices_stats['indices'].items():
-            doc_count = stats['total']['docs']['count']
-            total_docs += doc_count
-            if verbose:
-                print(f"Index {idx}: {doc_count} documents")
-        
+
+        # Batch the document count and the latest-document lookup into one
+        # msearch round trip instead of separate stats and search calls,
+        # targeting the already-resolved indices rather than the wildcard
+        target_indices = ','.join(concrete_indices)
+        responses = (await es.msearch(body=[
+            {"index": target_indices, "ignore_unavailable": True},
+            {"size": 0, "track_total_hits": True},
+            {"index": target_indices, "ignore_unavailable": True},
+            {"size": 1, "sort": [{"@timestamp": {"order": "desc"}}]}
+        ]))['responses']
+
+        count_response, sample_response = responses
+
+        if 'error' in count_response:
+            # The indices resolved just above, so this is a real search
+            # failure rather than a missing index
+            error = count_response['error']
+            reason = error.get('reason', error) if isinstance(error, dict) else error
+            print(f"Error querying Elasticsearch: {reason}")
+            return False
+
+        total_docs = count_response['hits']['total']['value']
+
         if total_docs > 0:
             print(f"Found {total_docs} total documents across all indices matching {index_pattern}")
-            
-            # Get a sample document
-            results = es.search(
-                index=index_pattern,
-                body={
-                    "size": 1,
-                    "sort": [{"@timestamp": {"order": "desc"}}]
-                }
-            )
-            
-            if results['hits']['hits']:
-                sample = results['hits']['hits'][0]
+
+            if verbose:
+                # Per-index breakdown via _cat/indices: a compact per-index
+                # array instead of the multi-MB indices.stats payload
+                cat_rows = await es.cat.indices(index=target_indices, h='index,docs.count', format='json')
+                for row in cat_rows:
+                    print(f"Index {row['index']}: {row['docs.count']} documents")
+
+            if 'error' not in sample_response and sample_response['hits']['hits']:
+                sample = sample_response['hits']['hits'][0]
                 print(f"Latest document from index: {sample['_index']}")
                 print(f"Document timestamp: {sample['_source'].get('@timestamp', 'N/A')}")
                 
@@ -95,52 +111,69 @@ def check_data_exists(es, index_pattern=None, verbose=False):
         print(f"Error checking Elasticsearch: {str(e)}")
         return False
 
-def main():
-    args = parse_args()
-    
+async def run(args):
     # Connect to Elasticsearch
     try:
-        es = Elasticsearch(
+        # Short per-request timeout with retries keeps one stuck request
+        # from eating the wait budget; compression shrinks the response
+        # bodies crossing the Cloud link
+        es = AsyncElasticsearch(
             cloud_id=args.cloud_id,
-            api_key=args.api_key
+            api_key=args.api_key,
+            timeout=5,
+            max_retries=2,
+            retry_on_timeout=True,
+            http_compress=True,
+            sniff_on_start=False
         )
-        
-        # Verify connection
-        if not es.ping():
-            print("Failed to connect to Elasticsearch. Check your credentials and network connection.")
-            sys.exit(1)
-            
+        # No ping round trip here; connection problems surface immediately
+        # on the first msearch in check_data_exists
     except Exception as e:
         print(f"Error connecting to Elasticsearch: {str(e)}")
-        sys.exit(1)
-    
+        return 1
+
     index_pattern = args.index if args.index else get_today_index()
-    
-    if args.wait > 0:
-        print(f"Waiting up to {args.wait} seconds for data...")
-        start_time = time.time()
-        while time.time() - start_time < args.wait:
-            if check_data_exists(es, index_pattern, args.verbose):
-                print("\nSuccess: Data found in Elasticsearch!")
-                sys.exit(0)
-            
-            remaining = args.wait - (time.time() - start_time)
-            if remaining <= 0:
-                break
-                
-            wait_time = min(10, remaining)
-            print(f"No data found yet. Waiting {wait_time:.0f} seconds before retrying...")
-            time.sleep(wait_time)
-        
-        print(f"\nError: No data found after waiting {args.wait} seconds.")
-        sys.exit(1)
-    else:
-        if check_data_exists(es, index_pattern, args.verbose):
-            print("\nSuccess: Data found in Elasticsearch!")
-            sys.exit(0)
+
+    try:
+        if args.wait > 0:
+            print(f"Waiting up to {args.wait} seconds for data...")
+            # Monotonic clock so wall-clock jumps (NTP steps, DST) can
+            # neither end the wait early nor stall it. The cadence is
+            # adaptive: start polling at 500ms so fresh data is caught
+            # almost immediately, then back off geometrically to a 10s
+            # ceiling during long empty waits
+            interval = 0.5
+            start_time = time.monotonic()
+            deadline = start_time + args.wait
+            while time.monotonic() < deadline:
+                if await check_data_exists(es, index_pattern, args.verbose):
+                    print("\nSuccess: Data found in Elasticsearch!")
+                    return 0
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                wait_time = min(interval, remaining)
+                print(f"No data found yet. Waiting {wait_time:.1f} seconds before retrying...")
+                await asyncio.sleep(wait_time)
+                interval = min(10, interval * 1.5)
+
+            print(f"\nError: No data found after waiting {args.wait} seconds.")
+            return 1
         else:
-            print("\nError: No data found in Elasticsearch.")
-            sys.exit(1)
+            if await check_data_exists(es, index_pattern, args.verbose):
+                print("\nSuccess: Data found in Elasticsearch!")
+                return 0
+            else:
+                print("\nError: No data found in Elasticsearch.")
+                return 1
+    finally:
+        await es.close()
+
+def main():
+    args = parse_args()
+    sys.exit(asyncio.run(run(args)))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
